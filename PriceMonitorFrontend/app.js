@@ -5,10 +5,57 @@ const CONFIG = {
 
 console.log('📊 Destination Price Monitor - Loading from Vercel');
 
-let priceData = [];
+let itineraries = [];
+let currentItinerary = 0;
 let chart = null;
 let currentRange = 'all';
 
+// CSV parsing, aggregation and decimation run off the main thread
+const csvWorker = new Worker('csv-worker.js');
+const pendingRequests = new Map();
+let nextRequestId = 0;
+let workerError = null;
+
+csvWorker.onmessage = (e) => {
+    const { id, type, message } = e.data;
+    const pending = pendingRequests.get(id);
+    if (!pending) return;
+    pendingRequests.delete(id);
+    if (type === 'error') {
+        pending.reject(new Error(message));
+    } else {
+        pending.resolve(e.data);
+    }
+};
+
+// Fail every pending request instead of leaving them unresolved
+function rejectPendingRequests(error) {
+    pendingRequests.forEach(pending => pending.reject(error));
+    pendingRequests.clear();
+}
+
+// Worker failed to load (404, CSP) or threw outside its message handler
+csvWorker.onerror = (e) => {
+    e.preventDefault();
+    workerError = new Error(`CSV worker error: ${e.message || 'failed to load csv-worker.js'}`);
+    rejectPendingRequests(workerError);
+};
+
+csvWorker.onmessageerror = () => {
+    rejectPendingRequests(new Error('CSV worker sent a message that could not be read'));
+};
+
+// Send a message to the worker and resolve with its reply
+function workerRequest(message) {
+    if (workerError) return Promise.reject(workerError);
+    
+    const id = nextRequestId++;
+    return new Promise((resolve, reject) => {
+        pendingRequests.set(id, { resolve, reject });
+        csvWorker.postMessage({ id, ...message });
+    });
+}
+
 // Mask price: show only thousands and above, mask hundreds and below with X
 function maskPrice(price) {
     const numPrice = parseInt(price);
@@ -39,26 +86,18 @@ async function loadPriceData() {
     
     try {
         const url = CONFIG.csvUrl + `?_=${Date.now()}`;
+        const result = await workerRequest({ type: 'load', url });
         
-        const response = await fetch(url, {
-            method: 'GET',
-            cache: 'no-cache'
-        });
-        
-        if (!response.ok) {
-            throw new Error(`Failed to fetch CSV: HTTP ${response.status}`);
-        }
-        
-        const csvText = await response.text();
-        priceData = parseCSV(csvText);
-        
-        if (priceData.length === 0) {
+        if (result.count === 0) {
             throw new Error('No price data found in CSV');
         }
+        itineraries = result.itineraries;
+        currentItinerary = result.defaultItinerary;
         
         // Update UI
+        populateItinerarySelect();
         updateStats();
-        createChart();
+        await createChart();
         
         loadingOverlay.classList.add('hidden');
     } catch (error) {
@@ -80,41 +119,36 @@ async function loadPriceData() {
     }
 }
 
-// Parse CSV text into array of objects
-function parseCSV(csvText) {
-    const lines = csvText.trim().split('\n');
-    if (lines.length < 2) return [];
-    
-    const headers = lines[0].split(',');
-    
-    return lines.slice(1).map(line => {
-        const values = line.split(',');
-        const row = {};
-        headers.forEach((header, index) => {
-            row[header.trim()] = values[index]?.trim() || '';
-        });
-        return row;
-    }).filter(row => row.price_check_date);
+// Fill the itinerary picker; hidden when only one trip is tracked
+function populateItinerarySelect() {
+    const select = document.getElementById('itinerarySelect');
+    select.innerHTML = '';
+    itineraries.forEach(itinerary => {
+        const option = document.createElement('option');
+        option.value = itinerary.id;
+        option.textContent = formatItinerary(itinerary);
+        select.appendChild(option);
+    });
+    select.value = currentItinerary;
+    select.hidden = itineraries.length < 2;
 }
 
-// Update statistics cards
+// Update statistics cards for the selected itinerary
 function updateStats() {
-    if (priceData.length === 0) return;
+    const itinerary = itineraries[currentItinerary];
+    if (!itinerary || !itinerary.stats) return;
     
-    const sortedData = [...priceData].sort((a, b) => 
-        new Date(b.price_check_date) - new Date(a.price_check_date)
-    );
+    document.getElementById('dateRange').textContent = `${itinerary.startDate} to ${itinerary.endDate}`;
     
-    const latest = sortedData[0];
-    const previous = sortedData[1];
+    const { latest, previous, oldest, lowest } = itinerary.stats;
     
     // Current Best Price
-    const currentPrice = parseInt(latest.best_price);
+    const currentPrice = latest.bestPrice;
     document.getElementById('currentPrice').textContent = maskPrice(currentPrice);
     
     // Price Change
     if (previous) {
-        const previousPrice = parseInt(previous.best_price);
+        const previousPrice = previous.bestPrice;
         const change = currentPrice - previousPrice;
         const changePercent = ((change / previousPrice) * 100).toFixed(1);
         const changeElement = document.getElementById('priceChange');
@@ -132,17 +166,13 @@ function updateStats() {
     }
     
     // Lowest Price
-    const lowestEntry = priceData.reduce((min, entry) => 
-        parseInt(entry.best_price) < parseInt(min.best_price) ? entry : min
-    );
-    document.getElementById('lowestPrice').textContent = maskPrice(lowestEntry.best_price);
-    document.getElementById('lowestDate').textContent = formatDate(lowestEntry.price_check_date);
+    document.getElementById('lowestPrice').textContent = maskPrice(lowest.bestPrice);
+    document.getElementById('lowestDate').textContent = formatDate(lowest.date);
     
     // Trend (since day 1)
-    if (sortedData.length > 1) {
-        const oldest = sortedData[sortedData.length - 1];
-        const trendChange = currentPrice - parseInt(oldest.best_price);
-        const trendPercent = ((trendChange / parseInt(oldest.best_price)) * 100).toFixed(1);
+    if (previous) {
+        const trendChange = currentPrice - oldest.bestPrice;
+        const trendPercent = ((trendChange / oldest.bestPrice) * 100).toFixed(1);
         
         document.getElementById('trend').textContent = `${trendPercent}%`;
         const indicator = document.getElementById('trendIndicator');
@@ -160,22 +190,29 @@ function updateStats() {
     }
     
     // Last Update
-    document.getElementById('lastUpdate').textContent = formatDate(latest.price_check_date);
+    document.getElementById('lastUpdate').textContent = formatDate(latest.date);
 }
 
-// Create price chart
-function createChart() {
-    const ctx = document.getElementById('priceChart').getContext('2d');
+// Create price chart, decimated to roughly one point per pixel of chart width
+async function createChart() {
+    const canvas = document.getElementById('priceChart');
+    const ctx = canvas.getContext('2d');
     
-    const filteredData = getFilteredData(currentRange);
+    const range = currentRange;
+    const itinerary = currentItinerary;
+    const series = await workerRequest({
+        type: 'range',
+        itinerary,
+        days: range,
+        width: canvas.parentElement.clientWidth,
+    });
     
-    const sortedData = filteredData.sort((a, b) => 
-        new Date(a.price_check_date) - new Date(b.price_check_date)
-    );
+    // A newer range or itinerary was selected while this one was being decimated
+    if (range !== currentRange || itinerary !== currentItinerary) return;
     
-    const labels = sortedData.map(d => formatDate(d.price_check_date));
-    const bestPrices = sortedData.map(d => parseInt(d.best_price));
-    const initialPrices = sortedData.map(d => parseInt(d.initial_price));
+    const labels = Array.from(series.timestamps, formatDate);
+    const bestPrices = Array.from(series.bestPrices);
+    const initialPrices = Array.from(series.initialPrices);
     
     if (chart) {
         chart.destroy();
@@ -274,16 +311,6 @@ function createChart() {
     });
 }
 
-// Get filtered data based on range
-function getFilteredData(days) {
-    if (days === 'all') return priceData;
-    
-    const cutoffDate = new Date();
-    cutoffDate.setDate(cutoffDate.getDate() - days);
-    
-    return priceData.filter(d => new Date(d.price_check_date) >= cutoffDate);
-}
-
 // Setup event listeners
 function setupEventListeners() {
     document.querySelectorAll('.btn-control').forEach(btn => {
@@ -296,31 +323,46 @@ function setupEventListeners() {
             createChart();
         });
     });
+    
+    document.getElementById('itinerarySelect').addEventListener('change', (e) => {
+        currentItinerary = parseInt(e.target.value);
+        updateStats();
+        createChart();
+    });
 }
 
 // Download CSV
-function downloadCSV() {
-    const csvContent = convertToCSV(priceData);
-    const blob = new Blob([csvContent], { type: 'text/csv' });
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = `resort_prices_${new Date().toISOString().split('T')[0]}.csv`;
-    document.body.appendChild(a);
-    a.click();
-    document.body.removeChild(a);
-    window.URL.revokeObjectURL(url);
+async function downloadCSV() {
+    try {
+        const response = await fetch(CONFIG.csvUrl + `?_=${Date.now()}`, { cache: 'no-cache' });
+        
+        if (!response.ok) {
+            throw new Error(`Failed to fetch CSV: HTTP ${response.status}`);
+        }
+        
+        const blob = await response.blob();
+        const url = window.URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = `resort_prices_${new Date().toISOString().split('T')[0]}.csv`;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        window.URL.revokeObjectURL(url);
+    } catch (error) {
+        console.error('Error downloading CSV:', error);
+        alert('Could not download price history. Please try again.');
+    }
 }
 
-function convertToCSV(data) {
-    const headers = Object.keys(data[0]).join(',');
-    const rows = data.map(row => Object.values(row).join(','));
-    return [headers, ...rows].join('\n');
+// Format an itinerary for the picker
+function formatItinerary(itinerary) {
+    return `${itinerary.startDate} to ${itinerary.endDate} (${itinerary.adults} adults, ${itinerary.kids} kids)`;
 }
 
 // Format date for display
-function formatDate(dateString) {
-    const date = new Date(dateString);
+function formatDate(dateValue) {
+    const date = new Date(dateValue);
     return date.toLocaleDateString('en-US', { 
         month: 'short', 
         day: 'numeric', 
@@ -0,0 +1,315 @@
+// CSV parsing and chart decimation worker
+//
+// Keeps the parsed history in typed arrays, one series per itinerary
+// (trip dates + party), so range switches only re-slice and re-decimate,
+// never re-parse.
+//
+// Messages in:
+//   { id, type: 'load', url }        fetch and parse a CSV
+//   { id, type: 'load', csvText }    parse CSV text directly
+//   { id, type: 'range', itinerary, days, width }
+// Messages out:
+//   { id, type: 'loaded', count, itineraries, defaultItinerary }
+//   { id, type: 'range', count, timestamps, bestPrices, initialPrices }
+//   { id, type: 'error', message }
+
+const ITINERARY_COLUMNS = ['start_date', 'end_date', 'number_of_adults', 'number_of_kids'];
+
+let history = null;
+
+self.onmessage = async (e) => {
+    const msg = e.data;
+    try {
+        if (msg.type === 'load') {
+            const csvText = msg.csvText !== undefined ? msg.csvText : await fetchCSV(msg.url);
+            history = parseCSV(csvText);
+            const itineraries = history.itineraries.map((itinerary, i) => ({
+                ...itinerary,
+                stats: computeStats(history.series[i]),
+            }));
+            self.postMessage({
+                id: msg.id,
+                type: 'loaded',
+                count: history.count,
+                itineraries,
+                defaultItinerary: latestItinerary(history.series),
+            });
+        } else if (msg.type === 'range') {
+            if (!history) throw new Error('No price data loaded');
+            const data = history.series[msg.itinerary];
+            if (!data) throw new Error(`Unknown itinerary: ${msg.itinerary}`);
+            const series = getRangeSeries(data, msg.days, msg.width);
+            self.postMessage(
+                { id: msg.id, type: 'range', ...series },
+                [series.timestamps.buffer, series.bestPrices.buffer, series.initialPrices.buffer]
+            );
+        } else {
+            throw new Error(`Unknown message type: ${msg.type}`);
+        }
+    } catch (error) {
+        self.postMessage({ id: msg.id, type: 'error', message: error.message });
+    }
+};
+
+async function fetchCSV(url) {
+    const response = await fetch(url, {
+        method: 'GET',
+        cache: 'no-cache'
+    });
+
+    if (!response.ok) {
+        throw new Error(`Failed to fetch CSV: HTTP ${response.status}`);
+    }
+
+    return response.text();
+}
+
+// Parse CSV text into one date-sorted set of typed arrays per itinerary
+function parseCSV(csvText) {
+    const text = csvText.trim();
+    const empty = { count: 0, itineraries: [], series: [] };
+    const headerEnd = text.indexOf('\n');
+    if (headerEnd === -1) return empty;
+
+    const headers = text.slice(0, headerEnd).split(',').map(h => h.trim());
+    const dateCol = headers.indexOf('price_check_date');
+    const bestCol = headers.indexOf('best_price');
+    const initialCol = headers.indexOf('initial_price');
+    const itineraryCols = ITINERARY_COLUMNS.map(column => headers.indexOf(column));
+    if (dateCol === -1) return empty;
+
+    // Upper bound on row count, so arrays are allocated once
+    let capacity = 0;
+    for (let i = headerEnd; i !== -1; i = text.indexOf('\n', i + 1)) capacity++;
+
+    const timestamps = new Float64Array(capacity);
+    const bestPrices = new Float64Array(capacity);
+    const initialPrices = new Float64Array(capacity);
+    const itineraryIds = new Uint32Array(capacity);
+    const itineraryIndex = new Map();
+    const itineraries = [];
+
+    let n = 0;
+    let pos = headerEnd + 1;
+    while (pos <= text.length) {
+        let end = text.indexOf('\n', pos);
+        if (end === -1) end = text.length;
+        const values = text.slice(pos, end).split(',');
+        pos = end + 1;
+
+        const date = values[dateCol]?.trim();
+        if (!date) continue;
+
+        const fields = itineraryCols.map(col => values[col]?.trim() || '');
+        const key = fields.join(',');
+        let itineraryId = itineraryIndex.get(key);
+        if (itineraryId === undefined) {
+            itineraryId = itineraries.length;
+            itineraryIndex.set(key, itineraryId);
+            itineraries.push({
+                id: itineraryId,
+                startDate: fields[0],
+                endDate: fields[1],
+                adults: fields[2],
+                kids: fields[3],
+                count: 0,
+            });
+        }
+        itineraries[itineraryId].count++;
+
+        timestamps[n] = new Date(date).getTime();
+        bestPrices[n] = parseInt(values[bestCol]);
+        initialPrices[n] = parseInt(values[initialCol]);
+        itineraryIds[n] = itineraryId;
+        n++;
+    }
+
+    // Bucket rows by itinerary, keeping file order within each bucket
+    const series = itineraries.map(itinerary => ({
+        length: itinerary.count,
+        timestamps: new Float64Array(itinerary.count),
+        bestPrices: new Float64Array(itinerary.count),
+        initialPrices: new Float64Array(itinerary.count),
+    }));
+    const cursors = new Uint32Array(itineraries.length);
+    for (let i = 0; i < n; i++) {
+        const target = series[itineraryIds[i]];
+        const j = cursors[itineraryIds[i]]++;
+        target.timestamps[j] = timestamps[i];
+        target.bestPrices[j] = bestPrices[i];
+        target.initialPrices[j] = initialPrices[i];
+    }
+
+    return { count: n, itineraries, series: series.map(sortByDate) };
+}
+
+// Sort one series by date; the CSV is appended daily so this is usually already ordered
+function sortByDate(data) {
+    const n = data.length;
+    const order = new Uint32Array(n);
+    let sorted = true;
+    for (let i = 0; i < n; i++) {
+        order[i] = i;
+        if (i > 0 && data.timestamps[i] < data.timestamps[i - 1]) sorted = false;
+    }
+    if (sorted) return data;
+
+    order.sort((a, b) => data.timestamps[a] - data.timestamps[b]);
+    const result = {
+        length: n,
+        timestamps: new Float64Array(n),
+        bestPrices: new Float64Array(n),
+        initialPrices: new Float64Array(n),
+    };
+    for (let i = 0; i < n; i++) {
+        result.timestamps[i] = data.timestamps[order[i]];
+        result.bestPrices[i] = data.bestPrices[order[i]];
+        result.initialPrices[i] = data.initialPrices[order[i]];
+    }
+    return result;
+}
+
+// Itinerary with the most recent price check (the last one on ties)
+function latestItinerary(series) {
+    let latest = -1;
+    for (let i = 0; i < series.length; i++) {
+        if (latest === -1 || series[i].timestamps[series[i].length - 1] >= series[latest].timestamps[series[latest].length - 1]) {
+            latest = i;
+        }
+    }
+    return latest;
+}
+
+// Aggregate the values shown in the statistics cards
+function computeStats(data) {
+    const n = data.length;
+    if (n === 0) return null;
+
+    const point = (i) => ({ date: data.timestamps[i], bestPrice: data.bestPrices[i] });
+
+    let lowest = 0;
+    for (let i = 1; i < n; i++) {
+        if (data.bestPrices[i] < data.bestPrices[lowest]) lowest = i;
+    }
+
+    return {
+        latest: point(n - 1),
+        previous: n > 1 ? point(n - 2) : null,
+        oldest: point(0),
+        lowest: point(lowest),
+    };
+}
+
+// Slice the history to the requested range and decimate it to the chart width
+function getRangeSeries(data, days, width) {
+    let start = 0;
+    if (days !== 'all') {
+        const cutoffDate = new Date();
+        cutoffDate.setDate(cutoffDate.getDate() - days);
+        start = lowerBound(data.timestamps, cutoffDate.getTime());
+    }
+
+    const timestamps = data.timestamps.subarray(start);
+    const bestPrices = data.bestPrices.subarray(start);
+    const initialPrices = data.initialPrices.subarray(start);
+
+    // Decimate each series on its own and keep the union of the picked points,
+    // so steps in one line are never dropped because of the other's shape
+    const threshold = Math.max(3, Math.floor(width));
+    const indices = mergeIndices(
+        lttbIndices(timestamps, bestPrices, threshold),
+        lttbIndices(timestamps, initialPrices, threshold)
+    );
+
+    return {
+        count: timestamps.length,
+        timestamps: pick(timestamps, indices),
+        bestPrices: pick(bestPrices, indices),
+        initialPrices: pick(initialPrices, indices),
+    };
+}
+
+// First index whose value is >= target
+function lowerBound(values, target) {
+    let lo = 0;
+    let hi = values.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (values[mid] < target) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+// Sorted union of two ascending index arrays
+function mergeIndices(a, b) {
+    const merged = new Uint32Array(a.length + b.length);
+    let i = 0;
+    let j = 0;
+    let n = 0;
+    while (i < a.length || j < b.length) {
+        const next = j >= b.length || (i < a.length && a[i] <= b[j]) ? a[i] : b[j];
+        if (i < a.length && a[i] === next) i++;
+        if (j < b.length && b[j] === next) j++;
+        merged[n++] = next;
+    }
+    return merged.subarray(0, n);
+}
+
+function pick(values, indices) {
+    const out = new Float64Array(indices.length);
+    for (let i = 0; i < indices.length; i++) out[i] = values[indices[i]];
+    return out;
+}
+
+// Largest-Triangle-Three-Buckets: choose `threshold` indices that keep the
+// visual shape of the (x, y) series. Returns every index when already small enough.
+function lttbIndices(x, y, threshold) {
+    const n = x.length;
+    if (n <= threshold) {
+        const all = new Uint32Array(n);
+        for (let i = 0; i < n; i++) all[i] = i;
+        return all;
+    }
+
+    const indices = new Uint32Array(threshold);
+    const bucketSize = (n - 2) / (threshold - 2);
+    let a = 0;
+    indices[0] = 0;
+
+    for (let i = 0; i < threshold - 2; i++) {
+        // Average of the next bucket is the third triangle vertex
+        const nextStart = Math.floor((i + 1) * bucketSize) + 1;
+        const nextEnd = Math.min(Math.floor((i + 2) * bucketSize) + 1, n);
+        let avgX = 0;
+        let avgY = 0;
+        for (let j = nextStart; j < nextEnd; j++) {
+            avgX += x[j];
+            avgY += y[j];
+        }
+        const nextLen = nextEnd - nextStart;
+        avgX /= nextLen;
+        avgY /= nextLen;
+
+        // Pick the point in the current bucket forming the largest triangle
+        const start = Math.floor(i * bucketSize) + 1;
+        const end = Math.floor((i + 1) * bucketSize) + 1;
+        let maxArea = -1;
+        let chosen = start;
+        for (let j = start; j < end; j++) {
+            const area = Math.abs(
+                (x[a] - avgX) * (y[j] - y[a]) - (x[a] - x[j]) * (avgY - y[a])
+            );
+            if (area > maxArea) {
+                maxArea = area;
+                chosen = j;
+            }
+        }
+
+        indices[i + 1] = chosen;
+        a = chosen;
+    }
+
+    indices[threshold - 1] = n - 1;
+    return indices;
+}
@@ -2,7 +2,7 @@
 Price Change Notifier - Sends email alerts when prices change
 
 This script:
-1. Compares the latest two CSV entries
+1. Reads the latest CSV entries per itinerary (S3 tail or local file)
 2. Detects if the best_price changed
 3. Sends email notification to configured recipients
 """
@@ -13,9 +13,25 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
-from typing import Dict, List, Optional
+from io import StringIO
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+# Bytes fetched from the end of the S3 history on the first range GET,
+# and the most the window may grow to before giving up on older rows
+S3_TAIL_BYTES = 4096
+S3_TAIL_MAX_BYTES = 256 * 1024
+
+# Columns that identify one monitored trip
+ITINERARY_FIELDS = ('start_date', 'end_date', 'number_of_adults', 'number_of_kids')
+
+# ETag of the last history object whose changes were fully notified, per
+# (bucket, key). Module-level so it survives warm Lambda invocations.
+_last_seen_etags: Dict[Tuple[str, str], str] = {}
+
+# (bucket, key, etag) identifying one version of the S3 history object
+HistoryVersion = Tuple[str, str, str]
+
 
 def load_env_file():
     """Load .env file from project root."""
@@ -29,6 +45,20 @@ def load_env_file():
                     os.environ.setdefault(key.strip(), value.strip())
 
 
+load_env_file()
+
+# Initialize S3 client (same backend as site_price_parser.save_to_s3).
+# S3_ENDPOINT_URL points at a local S3 stand-in (e.g. MinIO) for testing.
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+    s3_client = boto3.client('s3', endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None)
+    S3_AVAILABLE = True
+except Exception:
+    S3_AVAILABLE = False
+    s3_client = None
+
+
 def get_csv_path() -> Path:
     """Get the path to history.csv in PriceMonitorFrontend directory."""
     script_dir = Path(__file__).parent
@@ -51,6 +81,130 @@ def read_csv_entries() -> List[Dict]:
     return entries
 
 
+def read_history_entries() -> Tuple[Optional[List[Dict]], Optional[HistoryVersion]]:
+    """
+    Read history from the same storage backend the scraper writes to.
+    
+    STORAGE MODE:
+    - S3_BUCKET env var → tail of the S3 object (latest rows per itinerary)
+    - Local → PriceMonitorFrontend/history.csv
+    
+    Returns: (entries, version). entries is None if the S3 object is unchanged
+    since the last check; version is None for the local file. Pass version to
+    mark_history_processed() once notifications have been handled.
+    """
+    s3_bucket = os.environ.get('S3_BUCKET')
+    
+    if S3_AVAILABLE and s3_bucket:
+        return read_s3_tail_entries(s3_bucket, str(get_csv_path()))
+    return latest_entries_per_itinerary(read_csv_entries()), None
+
+
+def mark_history_processed(version: Optional[HistoryVersion]) -> None:
+    """Remember an S3 history version so the next check can skip it via If-None-Match."""
+    if version:
+        bucket, key, etag = version
+        _last_seen_etags[(bucket, key)] = etag
+
+
+def read_s3_tail_entries(bucket: str, key: str,
+                         tail_bytes: int = S3_TAIL_BYTES) -> Tuple[Optional[List[Dict]], Optional[HistoryVersion]]:
+    """
+    Read the latest two entries per recently checked itinerary from the end
+    of the S3 history.
+    
+    Uses suffix range GETs, doubling the window until every itinerary checked
+    on the newest date in it has two rows, the whole object has been read, or
+    the window reaches S3_TAIL_MAX_BYTES. The first request carries
+    If-None-Match with the last processed ETag, so an unchanged object costs
+    a single 304 response.
+    
+    Returns: (entries in file order, version), or (None, None) if the object is unchanged
+    """
+    cache_key = (bucket, key)
+    conditions = {}
+    if cache_key in _last_seen_etags:
+        conditions['IfNoneMatch'] = _last_seen_etags[cache_key]
+    
+    header = None
+    
+    try:
+        while True:
+            response = s3_client.get_object(Bucket=bucket, Key=key, Range=f'bytes=-{tail_bytes}', **conditions)
+            etag = response['ETag']
+            body = response['Body'].read()
+            object_size = _object_size(response)
+            complete = len(body) >= object_size
+            
+            # The first line of a partial tail may be cut mid-row
+            lines = body.decode('utf-8', errors='ignore').splitlines()
+            if complete:
+                header, lines = (lines[0], lines[1:]) if lines else (None, [])
+            else:
+                lines = lines[1:]
+            
+            # Later requests must see the same object version
+            conditions = {'IfMatch': etag}
+            
+            if header is None and not complete:
+                header_response = s3_client.get_object(Bucket=bucket, Key=key, Range='bytes=0-1023', **conditions)
+                header = header_response['Body'].read().decode('utf-8', errors='ignore').splitlines()[0]
+            
+            entries = list(csv.DictReader(StringIO('\n'.join([header] + lines)))) if header else []
+            active = active_itineraries(group_by_itinerary(entries))
+            
+            # A new trip has a single row; don't read the whole object looking for a second
+            if complete or tail_bytes >= S3_TAIL_MAX_BYTES:
+                break
+            if active and all(len(group) >= 2 for group in active.values()):
+                break
+            tail_bytes = min(tail_bytes * 2, S3_TAIL_MAX_BYTES)
+    except ClientError as e:
+        if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+            print(f"⏭️  History unchanged since last check: s3://{bucket}/{key}")
+            return None, None
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', 'InvalidRange'):
+            print(f"No history in S3 yet: s3://{bucket}/{key}")
+            return [], None
+        print(f"Error reading from S3: {e}")
+        return [], None
+    
+    print(f"Read {len(body)} of {object_size} bytes from s3://{bucket}/{key}")
+    return latest_entries_per_itinerary(entries), (bucket, key, etag)
+
+
+def _object_size(response: Dict) -> int:
+    """Total object size from a ranged GET (Content-Range: bytes 0-99/1234)."""
+    content_range = response.get('ContentRange')
+    if content_range:
+        return int(content_range.rsplit('/', 1)[1])
+    return response['ContentLength']
+
+
+def group_by_itinerary(entries: List[Dict]) -> Dict[Tuple, List[Dict]]:
+    """Group entries by itinerary, keeping file order within each group."""
+    groups = {}
+    for entry in entries:
+        key = tuple(entry.get(field) for field in ITINERARY_FIELDS)
+        groups.setdefault(key, []).append(entry)
+    return groups
+
+
+def active_itineraries(groups: Dict[Tuple, List[Dict]]) -> Dict[Tuple, List[Dict]]:
+    """Itineraries whose latest entry has the newest price_check_date (the ones that can have just changed)."""
+    if not groups:
+        return {}
+    newest = max(group[-1].get('price_check_date') or '' for group in groups.values())
+    return {key: group for key, group in groups.items() if group[-1].get('price_check_date') == newest}
+
+
+def latest_entries_per_itinerary(entries: List[Dict]) -> List[Dict]:
+    """Last two entries of each active itinerary, in file order."""
+    active = active_itineraries(group_by_itinerary(entries))
+    latest = {id(entry) for group in active.values() for entry in group[-2:]}
+    return [entry for entry in entries if id(entry) in latest]
+
+
 def detect_price_change(entries: List[Dict]) -> Optional[Dict]:
     """
     Compare last two entries to detect price changes.
@@ -220,24 +374,40 @@ def main():
         return
     
     # Read CSV entries
-    entries = read_csv_entries()
+    entries, history_version = read_history_entries()
+    if entries is None:
+        return
     if not entries:
         print("❌ No entries found in CSV")
         return
     
-    # Detect price changes
-    change_info = detect_price_change(entries)
-    if not change_info:
+    # Detect price changes per itinerary
+    changes = []
+    for itinerary_entries in group_by_itinerary(entries).values():
+        change_info = detect_price_change(itinerary_entries)
+        if change_info:
+            changes.append(change_info)
+    
+    if not changes:
         print("✅ No price changes detected")
+        mark_history_processed(history_version)
         return
     
-    print(f"\n🚨 Price change detected!")
-    print(f"   Previous best price: ${change_info['previous_best_price']}")
-    print(f"   New best price: ${change_info['latest_best_price']}")
-    print(f"   Change: ${change_info['price_difference']}")
+    all_sent = True
+    for change_info in changes:
+        print(f"\n🚨 Price change detected! ({change_info['start_date']} to {change_info['end_date']})")
+        print(f"   Previous best price: ${change_info['previous_best_price']}")
+        print(f"   New best price: ${change_info['latest_best_price']}")
+        print(f"   Change: ${change_info['price_difference']}")
+        
+        # Send notifications
+        if not send_email_notification(change_info, recipient_list):
+            all_sent = False
     
-    # Send notifications
-    send_email_notification(change_info, recipient_list)
+    # Only skip this history version next time if every alert went out,
+    # so a retry in the same warm container can resend failed ones
+    if all_sent:
+        mark_history_processed(history_version)
     print("=" * 60)
 
 
@@ -48,8 +48,9 @@ def load_env_file():
 load_env_file()
 
 # Initialize S3 client (available in Lambda)
+# S3_ENDPOINT_URL points at a local S3 stand-in (e.g. MinIO) for testing.
 try:
-    s3_client = boto3.client('s3')
+    s3_client = boto3.client('s3', endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None)
     S3_AVAILABLE = True
 except Exception:
     S3_AVAILABLE = False
@@ -375,6 +376,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 result['csv_saved'] = False
                 result['csv_error'] = str(csv_error)
         
+        # Check for price changes in the same (warm) invocation, reading the history just written
+        if result.get('csv_saved'):
+            try:
+                from price_change_notifier import main as notify_price_changes
+                notify_price_changes()
+            except Exception as notify_error:
+                result['notify_error'] = str(notify_error)
+        
         return {
             'statusCode': 200 if result['success'] else 500,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
@@ -428,15 +437,3 @@ if __name__ == "__main__":
     print("3. Frontend fetches from S3 with ?t=timestamp")
     print("4. Users see fresh data (max 1 min CDN delay)")
     print("=" * 60)
-    
-    # Send price change notification
-    print("\n" + "=" * 60)
-    print("CHECKING FOR PRICE CHANGES...")
-    print("=" * 60)
-    try:
-        from price_change_notifier import main as notify_price_changes
-        notify_price_changes()
-    except ImportError:
-        print("price_change_notifier module not found")
-    except Exception as e:
-        print(f"Error in price change notification: {e}")